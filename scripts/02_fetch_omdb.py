@@ -16,6 +16,20 @@ Reproducibility notes:
 Outputs:
     - data/raw/omdb_raw.jsonl   (raw JSON for provenance)
     - data/processed/omdb_from_netflix.csv
+    - data/snapshots/        (imdbVotes / imdbRating history, see snapshot_store.py)
+
+Snapshots:
+    - Every live fetch stamps each raw record with `fetched_at` and appends a
+      snapshot dated today (a same-day re-fetch is merged into it), so
+      re-fetching no longer loses the old values.
+    - Rebuilding from an existing JSONL only seeds an empty store, using the
+      records' `fetched_at` dates. Older JSONL files without it are not seeded,
+      since no real fetch date is known.
+
+Ratings:
+    - The nested `Ratings` list ({Source, Value} dicts) is exploded into typed
+      numeric columns while the JSON is still parsed (see RATING_COLUMNS), so the
+      CSV never holds a Python-repr string that needs re-parsing downstream.
 """
 
 import time
@@ -24,6 +38,9 @@ import requests
 import pandas as pd
 from pathlib import Path
 import hashlib
+from datetime import date
+
+from snapshot_store import SnapshotStore
 
 # ---------------------------------------------------------
 # Load API key
@@ -58,14 +75,60 @@ print(f"Loaded OMDb key from {key_path}")
 IDS_PATH = Path("data/processed/netflix_imdb_ids.csv")
 RAW_JSON = Path("data/raw/omdb_raw.jsonl")
 OUT_CSV  = Path("data/processed/omdb_from_netflix.csv")
+SNAPSHOT_DIR = Path("data/snapshots")
 
 # Fields to keep from OMDb
 KEEP = [
     "Title","Year","Rated","Released","Runtime","Genre","Director","Writer","Actors",
-    "Plot","Language","Country","Awards","Poster","Ratings","Metascore","imdbRating",
+    "Plot","Language","Country","Awards","Poster","Metascore","imdbRating",
     "imdbVotes","imdbID","Type","DVD","BoxOffice","Production","Website"
 ]
 
+# Ratings sources -> (output column, parser for the Value string)
+#   "7.2/10" -> 7.2    "85%" -> 85    "61/100" -> 61
+def _parse_fraction(value):
+    num, _, _ = value.partition("/")
+    return float(num)
+
+
+def _parse_percent(value):
+    return int(value.rstrip("%"))
+
+
+def _parse_score(value):
+    num, _, _ = value.partition("/")
+    return int(num)
+
+
+RATING_COLUMNS = {
+    "Internet Movie Database": ("imdb_rating_src", _parse_fraction),
+    "Rotten Tomatoes":         ("rt_pct", _parse_percent),
+    "Metacritic":              ("metacritic_score", _parse_score),
+}
+
+
+def explode_ratings(ratings) -> dict:
+    """Turn OMDb's Ratings list into {column: number}, one key per known source."""
+    out = dict.fromkeys(col for col, _ in RATING_COLUMNS.values())
+    for entry in ratings or ():
+        spec = RATING_COLUMNS.get(entry.get("Source"))
+        if spec is None:
+            continue
+        col, parse = spec
+        try:
+            out[col] = parse(entry.get("Value", ""))
+        except ValueError:
+            pass  # "N/A" or unexpected format -> leave missing
+    return out
+
+
+def extract_record(data: dict, imdb_id: str) -> dict:
+    """Keep the KEEP fields of one OMDb response plus exploded rating columns."""
+    subset = {k: data.get(k) for k in KEEP}
+    subset.update(explode_ratings(data.get("Ratings")))
+    subset["imdb_id"] = imdb_id
+    return subset
+
 # ---------------------------------------------------------
 # Fetch a single OMDb entry
 
@@ -76,6 +139,7 @@ def omdb_by_id(imdb_id: str) -> dict:
     r = requests.get(url, params=params, timeout=15)
     data = r.json()
     data["imdb_id"] = imdb_id
+    data["fetched_at"] = date.today().isoformat()
     return data
 
 # ---------------------------------------------------------
@@ -91,18 +155,28 @@ def main():
         
         # Rebuild CSV from JSONL
         results = []
+        fetched_at = []
         with RAW_JSON.open("r", encoding="utf-8") as f:
             for line in f:
                 data = json.loads(line)
                 if data.get("Response") == "True":
-                    subset = {k: data.get(k) for k in KEEP}
-                    subset["imdb_id"] = data.get("imdb_id")
-                    results.append(subset)
+                    results.append(extract_record(data, data.get("imdb_id")))
+                    fetched_at.append(data.get("fetched_at"))
         
         omdb_df = pd.DataFrame(results)
         OUT_CSV.parent.mkdir(parents=True, exist_ok=True)
         omdb_df.to_csv(OUT_CSV, index=False)
         print(f"Rebuilt {len(omdb_df)} rows in {OUT_CSV}")
+
+        # Seed an empty snapshot store, one snapshot per recorded fetch date
+        store = SnapshotStore(SNAPSHOT_DIR)
+        fetched_on = pd.Series(fetched_at, index=omdb_df.index, dtype=object)
+        if not store.dates():
+            if fetched_on.isna().all():
+                print("Raw JSONL has no fetched_at dates. Not seeding the snapshot store.")
+            for day, rows in omdb_df[fetched_on.notna()].groupby(fetched_on.dropna()):
+                n_written = store.record(rows, day)
+                print(f"Seeded snapshot {day} with {n_written} titles in {SNAPSHOT_DIR}")
         return
     
 
@@ -137,9 +211,7 @@ def main():
 
                 # Extract if successful
                 if data.get("Response") == "True":
-                    subset = {k: data.get(k) for k in KEEP}
-                    subset["imdb_id"] = imdb_id
-                    results.append(subset)
+                    results.append(extract_record(data, imdb_id))
                 else:
                     print(f"[{i}] {imdb_id}: OMDb error = {data.get('Error')}")
 
@@ -159,6 +231,12 @@ def main():
 
     print(f"Saved {len(omdb_df)} OMDb rows to: {OUT_CSV}")
 
+    # Append today's votes/rating to the snapshot history (changed titles only)
+    if not omdb_df.empty:
+        store = SnapshotStore(SNAPSHOT_DIR)
+        n_written = store.record(omdb_df, date.today())
+        print(f"Recorded {n_written} changed titles in snapshot store: {SNAPSHOT_DIR}")
+
     # Compute checksum for raw OMDb data
     print("Computing SHA-256 checksum for raw OMDb data...")
     checksum = compute_sha256(RAW_JSON)
@@ -94,6 +94,11 @@ def main():
     if "Metascore" in df.columns:
         df["Metascore_clean"] = pd.to_numeric(df["Metascore"], errors="coerce")
 
+    # Exploded Ratings columns from 02 (Rotten Tomatoes / Metacritic / IMDb)
+    for col in ["rt_pct", "metacritic_score", "imdb_rating_src"]:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
     # Year to numeric (some rows might have ranges or non-numeric)
     if "Year" in df.columns:
         df["Year_clean"] = pd.to_numeric(df["Year"], errors="coerce")
@@ -5,19 +5,26 @@ Purpose:
     - Integrate the cleaned Netflix and OMDb datasets into a single table.
     - Perform a join on imdb_id.
     - Save a simple summary for documentation.
+    - Report drift between the Netflix imdb_score/imdb_votes (captured earlier)
+      and the OMDb imdbRating/imdbVotes, plus 90-day vote growth from the
+      snapshot store when more than one snapshot exists.
 
 Inputs:
     - data/processed/netflix_clean.csv
     - data/processed/omdb_clean.csv
+    - data/snapshots/ (optional, written by 02_fetch_omdb.py)
 
 Outputs:
     - data/processed/netflix_omdb_merged.csv
     - results/integration_summary.csv
+    - results/netflix_omdb_drift.csv
 """
 
 from pathlib import Path
 import pandas as pd
 
+from snapshot_store import SnapshotStore
+
 # Paths
 NETFLIX_CLEAN = Path("data/processed/netflix_clean.csv")
 OMDB_CLEAN    = Path("data/processed/omdb_clean.csv")
@@ -25,6 +32,37 @@ OUT_MERGED    = Path("data/processed/netflix_omdb_merged.csv")
 
 RESULTS_DIR   = Path("results")
 INTEGRATION_SUMMARY = RESULTS_DIR / "integration_summary.csv"
+DRIFT_CSV     = RESULTS_DIR / "netflix_omdb_drift.csv"
+SNAPSHOT_DIR  = Path("data/snapshots")
+GROWTH_DAYS   = 90
+
+
+def drift_report(merged):
+    """Per-title differences between Netflix and OMDb IMDb rating/votes."""
+    drift = merged[["imdb_id"]].copy()
+    if "title" in merged.columns:
+        drift["title"] = merged["title"]
+
+    if "imdb_score" in merged.columns and "imdbRating_clean" in merged.columns:
+        drift["netflix_rating"] = merged["imdb_score"].round(1)
+        drift["omdb_rating"] = merged["imdbRating_clean"]
+        drift["rating_drift"] = (drift["omdb_rating"] - drift["netflix_rating"]).round(1)
+
+    if "imdb_votes" in merged.columns and "imdbVotes_clean" in merged.columns:
+        drift["netflix_votes"] = merged["imdb_votes"]
+        drift["omdb_votes"] = merged["imdbVotes_clean"]
+        drift["votes_drift"] = drift["omdb_votes"] - drift["netflix_votes"]
+        drift["votes_drift_pct"] = drift["votes_drift"] / drift["netflix_votes"].where(drift["netflix_votes"] > 0)
+
+    # Vote growth across our own repeated OMDb fetches
+    store = SnapshotStore(SNAPSHOT_DIR)
+    if len(store.dates()) > 1:
+        growth = store.vote_growth(days=GROWTH_DAYS)
+        drift = drift.merge(
+            growth[["imdb_id", f"vote_growth_{GROWTH_DAYS}d"]], on="imdb_id", how="left"
+        )
+
+    return drift
 
 
 def main():
@@ -87,6 +125,16 @@ def main():
         {"metric": "n_ids_omdb_only", "value": only_omdb},
         {"metric": "n_ids_intersection", "value": intersection},
     ]
+
+    # Netflix vs OMDb drift
+    drift = drift_report(merged)
+    drift.to_csv(DRIFT_CSV, index=False)
+    print(f"Saved Netflix vs OMDb drift report to: {DRIFT_CSV}")
+    if "rating_drift" in drift.columns:
+        print(f"Mean |rating drift| (OMDb - Netflix): {drift['rating_drift'].abs().mean():.3f}")
+    if "votes_drift_pct" in drift.columns:
+        print(f"Median votes drift (OMDb vs Netflix): {drift['votes_drift_pct'].median():.1%}")
+
     summary_df = pd.DataFrame(summary_rows)
     summary_df.to_csv(INTEGRATION_SUMMARY, index=False)
     print(f"Saved integration summary to: {INTEGRATION_SUMMARY}")
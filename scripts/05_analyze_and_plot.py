@@ -57,6 +57,7 @@ def main():
         "runtime_minutes",    # parsed runtime
         "imdbVotes_clean",    # parsed vote count
         "Metascore_clean",    # numeric metascore
+        "rt_pct",             # Rotten Tomatoes % (from OMDb Ratings; Metacritic duplicates Metascore)
         "Year_clean",         # numeric year
         "imdb_score",         # original Netflix rating if present
         "imdb_votes",         # original Netflix votes if present
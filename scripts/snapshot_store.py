@@ -0,0 +1,288 @@
+"""
+snapshot_store.py
+
+Purpose:
+    - Keep a compact history of the volatile OMDb metrics (imdbVotes, imdbRating)
+      across repeated fetches, instead of overwriting them on every re-run of
+      02_fetch_omdb.py.
+    - Used by 02_fetch_omdb.py (record a snapshot) and 04_merge.py (drift report).
+
+Layout (data/snapshots/):
+    - ids.txt            -> one imdb_id per line; the line number is its integer code
+    - YYYY-MM-DD.bin     -> one block per snapshot date, holding values ONLY for
+                            titles whose votes or rating changed since the previous
+                            snapshot, plus which titles that fetch observed at all
+
+Block encoding (all LEB128 varints, encoded/decoded with numpy, no per-row loops):
+    n | id deltas (sorted codes, delta from previous id) | vote deltas (zigzag,
+    delta from the title's previous stored value) | rating codes |
+    r | observed run lengths (alternating not-observed / observed, by id code)
+
+    Votes are stored as votes + 1 and ratings as round(rating * 10) + 1, so that
+    0 means "missing". Reading the store replays the blocks in date order.
+    Fetches are often partial (MAX_TITLES cap, OMDb request limit), so a title
+    missing from a snapshot is "not observed", not "unchanged".
+"""
+
+from datetime import date
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_DIR = Path("data/snapshots")
+
+
+# ---------- Varint / zigzag helpers ----------
+
+def encode_varints(values) -> bytes:
+    """Encode non-negative integers as LEB128 varints."""
+    rest = np.asarray(values, dtype=np.uint64).copy()
+    if rest.size == 0:
+        return b""
+
+    # bytes needed per value
+    nbytes = np.ones(rest.size, dtype=np.int64)
+    probe = rest >> np.uint64(7)
+    while probe.any():
+        nbytes += probe > 0
+        probe >>= np.uint64(7)
+
+    starts = np.cumsum(nbytes) - nbytes
+    out = np.empty(int(nbytes.sum()), dtype=np.uint8)
+    for k in range(int(nbytes.max())):
+        live = nbytes > k
+        byte = (rest[live] & np.uint64(0x7F)).astype(np.uint8)
+        more = (nbytes[live] > k + 1).astype(np.uint8) << 7
+        out[starts[live] + k] = byte | more
+        rest >>= np.uint64(7)
+    return out.tobytes()
+
+
+def decode_varints(buf: bytes) -> np.ndarray:
+    """Decode a buffer of LEB128 varints into a uint64 array."""
+    b = np.frombuffer(buf, dtype=np.uint8)
+    if b.size == 0:
+        return np.empty(0, dtype=np.uint64)
+
+    ends = np.flatnonzero(b < 0x80)
+    if ends.size == 0 or ends[-1] != b.size - 1:
+        raise ValueError("Truncated varint buffer.")
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    pos = np.arange(b.size) - np.repeat(starts, ends - starts + 1)
+    parts = (b & 0x7F).astype(np.uint64) << (7 * pos).astype(np.uint64)
+    # 7-bit groups never overlap, so a sum is the same as a bitwise OR
+    return np.add.reduceat(parts, starts)
+
+
+def zigzag_encode(values) -> np.ndarray:
+    v = np.asarray(values, dtype=np.int64)
+    return ((v << 1) ^ (v >> 63)).astype(np.uint64)
+
+
+def zigzag_decode(values) -> np.ndarray:
+    z = np.asarray(values, dtype=np.uint64)
+    return (z >> np.uint64(1)).astype(np.int64) ^ -(z & np.uint64(1)).astype(np.int64)
+
+
+def mask_to_runs(mask: np.ndarray) -> np.ndarray:
+    """Run lengths of a boolean mask, alternating False/True and starting with False."""
+    edges = np.flatnonzero(np.diff(mask.astype(np.int8))) + 1
+    runs = np.diff(np.concatenate(([0], edges, [mask.size])))
+    if mask.size and mask[0]:
+        runs = np.concatenate(([0], runs))
+    return runs
+
+
+def runs_to_mask(runs: np.ndarray, size: int) -> np.ndarray:
+    """Inverse of mask_to_runs; ids past the last run are False."""
+    mask = np.repeat(np.arange(len(runs)) % 2 == 1, runs.astype(np.int64))
+    return np.pad(mask, (0, size - mask.size))
+
+
+# ---------- Value codes (0 = missing) ----------
+
+def _votes_to_code(s: pd.Series) -> np.ndarray:
+    """'1,234' / 1234.0 / 'N/A' -> votes + 1, or 0 when missing."""
+    votes = pd.to_numeric(s.astype(str).str.replace(",", ""), errors="coerce")
+    return np.where(votes.notna(), votes.fillna(0).round() + 1, 0).astype(np.int64)
+
+
+def _rating_to_code(s: pd.Series) -> np.ndarray:
+    """7.2 / '7.2' / 'N/A' -> round(rating * 10) + 1, or 0 when missing."""
+    rating = pd.to_numeric(s, errors="coerce")
+    return np.where(rating.notna(), (rating.fillna(0) * 10).round() + 1, 0).astype(np.int64)
+
+
+def _code_to_votes(code: np.ndarray) -> np.ndarray:
+    return np.where(code > 0, code - 1, np.nan)
+
+
+def _code_to_rating(code: np.ndarray) -> np.ndarray:
+    return np.where(code > 0, (code - 1) / 10, np.nan)
+
+
+# ---------- Store ----------
+
+class SnapshotStore:
+    """Delta-encoded, changes-only history of imdbVotes / imdbRating per title."""
+
+    def __init__(self, root=SNAPSHOT_DIR):
+        self.root = Path(root)
+        self.ids_path = self.root / "ids.txt"
+        if self.ids_path.exists():
+            self.ids = self.ids_path.read_text(encoding="utf-8").split()
+        else:
+            self.ids = []
+        self.codes = {imdb_id: i for i, imdb_id in enumerate(self.ids)}
+
+    def dates(self) -> list:
+        """Snapshot dates (ISO strings) in chronological order."""
+        return sorted(p.stem for p in self.root.glob("*.bin"))
+
+    # ----- writing -----
+
+    def _encode_ids(self, imdb_ids: pd.Series) -> np.ndarray:
+        """Map imdb_ids to integer codes, appending unseen ids to ids.txt."""
+        new_ids = [i for i in imdb_ids.unique() if i not in self.codes]
+        if new_ids:
+            for imdb_id in new_ids:
+                self.codes[imdb_id] = len(self.ids)
+                self.ids.append(imdb_id)
+            self.root.mkdir(parents=True, exist_ok=True)
+            with self.ids_path.open("a", encoding="utf-8") as f:
+                f.write("".join(f"{i}\n" for i in new_ids))
+        return imdb_ids.map(self.codes).to_numpy(dtype=np.int64)
+
+    def record(self, df: pd.DataFrame, snapshot_date=None,
+               id_col="imdb_id", votes_col="imdbVotes", rating_col="imdbRating") -> int:
+        """
+        Store one snapshot of df, writing values only for titles that changed.
+        A second snapshot on the latest date is merged into it (new values win).
+        Returns the number of titles whose values were written.
+        """
+        snapshot_date = str(snapshot_date or date.today().isoformat())
+        existing = self.dates()
+        if existing and snapshot_date < existing[-1]:
+            raise ValueError(
+                f"Snapshot date {snapshot_date} is earlier than the latest "
+                f"stored snapshot ({existing[-1]}); the store is append-only."
+            )
+
+        df = df.dropna(subset=[id_col]).drop_duplicates(subset=[id_col])
+        ids = self._encode_ids(df[id_col].astype(str).str.strip())
+
+        # ids added just now are not in any block yet, so they replay as 0 (missing)
+        if snapshot_date in existing:
+            base_votes, base_ratings, _ = self._replay(existing[:-1])
+            votes, ratings, observed = self._replay(existing)
+        else:
+            base_votes, base_ratings, _ = self._replay(existing)
+            votes, ratings = base_votes.copy(), base_ratings.copy()
+            observed = np.zeros(len(self.ids), dtype=bool)
+
+        votes[ids] = _votes_to_code(df[votes_col])
+        ratings[ids] = _rating_to_code(df[rating_col])
+        observed[ids] = True
+
+        changed = np.flatnonzero(observed & ((votes != base_votes) | (ratings != base_ratings)))
+        runs = mask_to_runs(observed)
+        payload = encode_varints(
+            np.concatenate((
+                np.array([len(changed)], dtype=np.uint64),
+                np.diff(changed, prepend=0).astype(np.uint64),
+                zigzag_encode(votes[changed] - base_votes[changed]),
+                ratings[changed].astype(np.uint64),
+                np.array([len(runs)], dtype=np.uint64),
+                runs.astype(np.uint64),
+            ))
+        )
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / f"{snapshot_date}.bin").write_bytes(payload)
+        return len(changed)
+
+    # ----- reading -----
+
+    def _read_block(self, snapshot_date):
+        """Decode one block into (id codes, vote deltas, rating codes, observed mask)."""
+        values = decode_varints((self.root / f"{snapshot_date}.bin").read_bytes())
+        n = int(values[0])
+        ids = np.cumsum(values[1:1 + n].astype(np.int64))
+        vote_deltas = zigzag_decode(values[1 + n:1 + 2 * n])
+        ratings = values[1 + 2 * n:1 + 3 * n].astype(np.int64)
+        r = int(values[1 + 3 * n])
+        observed = runs_to_mask(values[2 + 3 * n:2 + 3 * n + r], len(self.ids))
+        return ids, vote_deltas, ratings, observed
+
+    def _replay(self, dates):
+        """
+        Replay the given blocks in order and return (vote codes, rating codes,
+        observed mask of the last block) per title.
+        """
+        size = len(self.ids)
+        votes = np.zeros(size, dtype=np.int64)
+        ratings = np.zeros(size, dtype=np.int64)
+        observed = np.zeros(size, dtype=bool)
+        for snapshot_date in dates:
+            ids, vote_deltas, block_ratings, observed = self._read_block(snapshot_date)
+            votes[ids] += vote_deltas
+            ratings[ids] = block_ratings
+        return votes, ratings, observed
+
+    def _state_at(self, snapshot_date=None):
+        """Replay every block dated on or before snapshot_date (default: all)."""
+        dates = self.dates()
+        if snapshot_date is not None:
+            dates = [d for d in dates if d <= str(snapshot_date)]
+        return self._replay(dates)
+
+    def history(self) -> pd.DataFrame:
+        """Long table of every recorded change: imdb_id, snapshot_date, imdb_votes, imdb_rating."""
+        frames = []
+        votes = np.zeros(len(self.ids), dtype=np.int64)
+        for snapshot_date in self.dates():
+            ids, vote_deltas, ratings, _ = self._read_block(snapshot_date)
+            votes[ids] += vote_deltas
+            frames.append(pd.DataFrame({
+                "imdb_id": np.asarray(self.ids, dtype=object)[ids],
+                "snapshot_date": snapshot_date,
+                "imdb_votes": _code_to_votes(votes[ids]),
+                "imdb_rating": _code_to_rating(ratings),
+            }))
+        if not frames:
+            return pd.DataFrame(columns=["imdb_id", "snapshot_date", "imdb_votes", "imdb_rating"])
+        return pd.concat(frames, ignore_index=True)
+
+    def state_as_of(self, snapshot_date=None) -> pd.DataFrame:
+        """Latest known imdb_votes / imdb_rating per title as of a date (default: latest)."""
+        votes, ratings, _ = self._state_at(snapshot_date)
+        seen = (votes > 0) | (ratings > 0)
+        return pd.DataFrame({
+            "imdb_id": np.asarray(self.ids, dtype=object)[seen],
+            "imdb_votes": _code_to_votes(votes[seen]),
+            "imdb_rating": _code_to_rating(ratings[seen]),
+        })
+
+    def vote_growth(self, days=90, end=None) -> pd.DataFrame:
+        """
+        Vote growth per title over the `days` window ending at `end`
+        (default: latest snapshot). Growth is NaN for titles with no snapshot
+        before the window start, or not observed in the last snapshot of the
+        window (their votes_end is only carried forward).
+        """
+        dates = self.dates()
+        end = date.fromisoformat(str(end or (dates[-1] if dates else date.today().isoformat())))
+        start = date.fromordinal(end.toordinal() - days)
+
+        end_votes, _, observed = self._state_at(end.isoformat())
+        start_votes, _, _ = self._state_at(start.isoformat())
+
+        seen = end_votes > 0
+        votes_start = _code_to_votes(start_votes[seen])
+        votes_end = _code_to_votes(end_votes[seen])
+        growth = np.where(observed[seen], votes_end - votes_start, np.nan)
+        return pd.DataFrame({
+            "imdb_id": np.asarray(self.ids, dtype=object)[seen],
+            "votes_start": votes_start,
+            "votes_end": votes_end,
+            f"vote_growth_{days}d": growth,
+        })